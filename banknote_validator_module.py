@@ -9,6 +9,8 @@ import re
 from typing import Set, Tuple, List, Dict, Optional
 from datetime import datetime
 
+from coin_validator_module import iterrows_column_values
+
 # ============================================================================
 # REPUBLIC YEAR CONVERSION SYSTEM (EXACT ORIGINAL LOGIC)
 # Using Taiwan government table: https://www.ris.gov.tw/app/portal/219
@@ -444,11 +446,15 @@ def validate_banknote_translations_batch(df: pd.DataFrame, chinese_col: str, eng
     issues = []
     inventory_col = df.columns[0] if len(df.columns) > 0 else None
     
+    # Normalize both text columns once instead of str()/pd.notna per cell, taking the cells as
+    # iterrows yields them so datetimes and numbers stringify as before; missing cells become ""
+    chinese_texts = ["" if pd.isna(value) else str(value) for value in iterrows_column_values(df, chinese_col)]
+    english_texts = ["" if pd.isna(value) else str(value) for value in iterrows_column_values(df, english_col)]
+    inventory_values = iterrows_column_values(df, inventory_col) if inventory_col else [None] * len(df)
+    
     # Process ALL rows as banknote lots (EXACT original behavior)
-    for index, row in df.iterrows():
-        chinese_text = str(row[chinese_col]) if pd.notna(row[chinese_col]) else ""
-        english_text = str(row[english_col]) if pd.notna(row[english_col]) else ""
-        
+    for index, inventory_value, chinese_text, english_text in zip(
+            df.index, inventory_values, chinese_texts, english_texts):
         # Skip empty rows
         if not chinese_text or not english_text:
             continue
@@ -457,7 +463,8 @@ def validate_banknote_translations_batch(df: pd.DataFrame, chinese_col: str, eng
         match, chinese_numbers, english_numbers, status, notes = analyze_banknote_translation(chinese_text, english_text)
         
         if not match:
-            inventory_value = row[inventory_col] if inventory_col else f"Row {index + 2}"
+            if not inventory_col:
+                inventory_value = f"Row {index + 2}"
             issues.append({
                 'Row': index + 2,
                 'Inventory': inventory_value,
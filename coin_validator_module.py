@@ -7,9 +7,11 @@ Enhanced Chinese compound numeral extraction and smart mismatch detection
 
 import re
 import os
+import multiprocessing
 import pandas as pd
-from typing import Set, Tuple, List, Dict, Optional
-from datetime import datetime
+import xlsxwriter
+from typing import Callable, Set, Tuple, List, Dict, Optional
+from datetime import date, datetime
 
 # ============================================================================
 # COMPLETE CHINESE NUMERAL EXTRACTION SYSTEM
@@ -303,6 +305,14 @@ def extract_era_names(text: str) -> List[str]:
     
     return found_eras
 
+def _match_era_year(era_name: str, english_years: Set[str]) -> Optional[str]:
+    """Return the first English year matching the era name, or None."""
+    valid_years = OFFICIAL_ERA_TABLE.get(era_name, ())
+    for year_str in english_years:
+        if int(year_str) in valid_years:
+            return year_str
+    return None
+
 def validate_era_names(era_names: List[str], english_years: Set[str]) -> Tuple[bool, str]:
     """Validate era names against official table (ONLY when era names are present)."""
     if not era_names:
@@ -312,9 +322,9 @@ def validate_era_names(era_names: List[str], english_years: Set[str]) -> Tuple[b
         if era_name in OFFICIAL_ERA_TABLE:
             valid_years = OFFICIAL_ERA_TABLE[era_name]
             # Check if any English year matches the era name
-            for year_str in english_years:
-                if int(year_str) in valid_years:
-                    return True, f"Era {era_name} matches year {year_str}"
+            year_str = _match_era_year(era_name, english_years)
+            if year_str is not None:
+                return True, f"Era {era_name} matches year {year_str}"
             # Era name is valid but doesn't match English years
             return False, f"Era {era_name} = {valid_years}, but English has {sorted(english_years)}"
         else:
@@ -328,6 +338,63 @@ def validate_era_names(era_names: List[str], english_years: Set[str]) -> Tuple[b
 # EXACT COPY from complete_fixed_validator.py
 # ============================================================================
 
+# Traditional measurement terms (Chinese units and their English names)
+# Chinese units are single characters, so a character-set test replaces substring scans
+TRADITIONAL_TERMS_CN = frozenset('钱分两文厘')
+TRADITIONAL_TERMS_EN = frozenset({'mace', 'candareen', 'tael', 'cash', 'li'})
+
+# Bits packed into the status dispatch key by analyze_translation_complete
+FLAG_CHINESE_EXTRA = 1 << 0
+FLAG_ENGLISH_EXTRA = 1 << 1
+FLAG_TRADITIONAL = 1 << 2
+FLAG_ND = 1 << 3
+FLAG_IMPLIED_ONE = 1 << 4
+
+def _status_hard_mismatch(chinese_extra: Set[str], english_extra: Set[str]) -> Tuple[bool, str, str]:
+    """Both Chinese and English have extra numbers = real error"""
+    notes = f"HARD MISMATCH: Chinese extra: {sorted(chinese_extra)}, English extra: {sorted(english_extra)}"
+    return False, "HARD_MISMATCH", notes
+
+def _status_implied_one(chinese_extra: Set[str], english_extra: Set[str]) -> Tuple[bool, str, str]:
+    """Traditional denomination implied (Chinese adds 1)"""
+    return True, "ACCEPTABLE", "Chinese correctly adds implied '1'"
+
+def _status_nd(chinese_extra: Set[str], english_extra: Set[str]) -> Tuple[bool, str, str]:
+    """Simple ND flexibility"""
+    return True, "ACCEPTABLE", "ND pattern allows flexibility"
+
+def _status_denomination_mismatch(chinese_extra: Set[str], english_extra: Set[str]) -> Tuple[bool, str, str]:
+    """Traditional measurements should match exactly"""
+    return False, "DENOMINATION_MISMATCH", "Traditional measurements don't match exactly"
+
+def _status_mismatch(chinese_extra: Set[str], english_extra: Set[str]) -> Tuple[bool, str, str]:
+    """Regular mismatch (not hard mismatch)"""
+    notes = ""
+    if chinese_extra:
+        notes += f"Chinese extra: {sorted(chinese_extra)}. "
+    if english_extra:
+        notes += f"English extra: {sorted(english_extra)}. "
+    return False, "MISMATCH", notes.strip()
+
+def _classify_status_flags(flags: int) -> Callable[[Set[str], Set[str]], Tuple[bool, str, str]]:
+    """
+    Resolve one flag combination through the original if-cascade.
+    Only used at import time to build _STATUS_DISPATCH.
+    Reached only after the MATCH check, so numbers never align exactly here.
+    """
+    if flags & FLAG_CHINESE_EXTRA and flags & FLAG_ENGLISH_EXTRA:
+        return _status_hard_mismatch
+    if flags & FLAG_IMPLIED_ONE and not flags & FLAG_ENGLISH_EXTRA:
+        return _status_implied_one
+    if flags & FLAG_ND:
+        return _status_nd
+    if flags & FLAG_TRADITIONAL:
+        return _status_denomination_mismatch
+    return _status_mismatch
+
+_ALL_STATUS_FLAGS = FLAG_CHINESE_EXTRA | FLAG_ENGLISH_EXTRA | FLAG_TRADITIONAL | FLAG_ND | FLAG_IMPLIED_ONE
+_STATUS_DISPATCH = {flags: _classify_status_flags(flags) for flags in range(_ALL_STATUS_FLAGS + 1)}
+
 def analyze_translation_complete(chinese_text: str, english_text: str) -> Tuple[bool, Set[str], Set[str], str, str]:
     """
     Complete translation analysis with all fixes applied.
@@ -339,6 +406,9 @@ def analyze_translation_complete(chinese_text: str, english_text: str) -> Tuple[
     - DENOMINATION_MISMATCH: Traditional measurements don't match exactly
     - ACCEPTABLE: ND flexibility, implied denominations, etc.
     """
+    # Cast once up front; the checks below reuse these strings directly
+    chinese_text = chinese_text if isinstance(chinese_text, str) else str(chinese_text)
+    english_text = english_text if isinstance(english_text, str) else str(english_text)
     
     # Extract numbers using COMPLETE systems
     chinese_numbers = extract_chinese_numbers_complete(chinese_text)
@@ -358,51 +428,34 @@ def analyze_translation_complete(chinese_text: str, english_text: str) -> Tuple[
     # Era name validation (ONLY if era names present in Chinese)
     era_names = extract_era_names(chinese_text)
     if era_names:
-        era_valid, era_msg = validate_era_names(era_names, english_data['years'])
-        if not era_valid:
+        # Only the first era name is checked; the message is only built when it is reported
+        if _match_era_year(era_names[0], english_data['years']) is None:
+            _, era_msg = validate_era_names(era_names, english_data['years'])
             return False, chinese_numbers, all_english_numbers, "ERA_MISMATCH", era_msg
         # If era valid, continue with other checks
     
-    # SMART MISMATCH DETECTION: Both have extra numbers = HARD_MISMATCH
-    chinese_extra = chinese_numbers - all_english_numbers
-    english_extra = all_english_numbers - chinese_numbers
-    
-    if chinese_extra and english_extra:
-        notes = f"HARD MISMATCH: Chinese extra: {sorted(chinese_extra)}, English extra: {sorted(english_extra)}"
-        return False, chinese_numbers, all_english_numbers, "HARD_MISMATCH", notes
-    
-    # Traditional denomination implied (Chinese adds 1)
-    if chinese_extra == {"1"} and not english_extra:
-        return True, chinese_numbers, all_english_numbers, "ACCEPTABLE", "Chinese correctly adds implied '1'"
-    
-    # ND pattern handling
-    if re.search(r'\bND\b', str(english_text), re.IGNORECASE):
-        # Simple ND flexibility
-        if not chinese_extra or not english_extra:
-            return True, chinese_numbers, all_english_numbers, "ACCEPTABLE", "ND pattern allows flexibility"
-    
-    # Traditional measurement check
-    traditional_terms = ['钱', '分', '两', '文', '厘']
-    english_measurements = ['mace', 'candareen', 'tael', 'cash', 'li']
-    
-    has_chinese_traditional = any(term in str(chinese_text) for term in traditional_terms)
-    has_english_measurements = any(term.lower() in str(english_text).lower() for term in english_measurements)
-    
-    if has_chinese_traditional and has_english_measurements:
-        # Traditional measurements should match exactly
-        if chinese_numbers != all_english_numbers:
-            return False, chinese_numbers, all_english_numbers, "DENOMINATION_MISMATCH", "Traditional measurements don't match exactly"
-        else:
-            return True, chinese_numbers, all_english_numbers, "MATCH", "Traditional measurements match"
-    
-    # Regular mismatch (not hard mismatch)
-    notes = ""
-    if chinese_extra:
-        notes += f"Chinese extra: {sorted(chinese_extra)}. "
-    if english_extra:
-        notes += f"English extra: {sorted(english_extra)}. "
-    
-    return False, chinese_numbers, all_english_numbers, "MISMATCH", notes.strip()
+    # SMART MISMATCH DETECTION: extras computed once, then every remaining
+    # status decision is a single table lookup on the packed flags
+    chinese_extra = chinese_numbers.difference(all_english_numbers)
+    english_extra = all_english_numbers.difference(chinese_numbers)
+    
+    # Traditional measurement terms present on both sides
+    english_lower = english_text.lower()
+    has_traditional = (not TRADITIONAL_TERMS_CN.isdisjoint(chinese_text) and
+                       any(term in english_lower for term in TRADITIONAL_TERMS_EN))
+    has_nd = re.search(r'\bND\b', english_text, re.IGNORECASE) is not None
+    
+    flags = ((FLAG_CHINESE_EXTRA if chinese_extra else 0) |
+             (FLAG_ENGLISH_EXTRA if english_extra else 0) |
+             (FLAG_TRADITIONAL if has_traditional else 0) |
+             (FLAG_ND if has_nd else 0) |
+             (FLAG_IMPLIED_ONE if chinese_extra == {"1"} else 0))
+    
+    match, status, notes = _STATUS_DISPATCH[flags](chinese_extra, english_extra)
+    return match, chinese_numbers, all_english_numbers, status, notes
+
+ENGLISH_LOT_INDICATORS = ['CHINA', 'Chinese', 'Qing', 'Republic of China', 'Cash', 'Tael', 'Mace']
+ENGLISH_LOT_INDICATOR_RE = re.compile('|'.join(re.escape(i) for i in ENGLISH_LOT_INDICATORS), re.IGNORECASE)
 
 def is_chinese_lot(chinese_text: str, english_text: str) -> bool:
     """Detect if this is a Chinese coin lot."""
@@ -421,10 +474,9 @@ def is_chinese_lot(chinese_text: str, english_text: str) -> bool:
             return True
     
     if isinstance(english_text, str):
-        english_indicators = ['CHINA', 'Chinese', 'Qing', 'Republic of China', 'Cash', 'Tael', 'Mace']
-        for indicator in english_indicators:
-            if indicator.upper() in english_text.upper():
-                return True
+        # One case-insensitive scan instead of upper-casing the text per indicator
+        if ENGLISH_LOT_INDICATOR_RE.search(english_text):
+            return True
     
     return False
 
@@ -433,51 +485,140 @@ def is_chinese_lot(chinese_text: str, english_text: str) -> bool:
 # Adapted to work with the unified validator system
 # ============================================================================
 
-def validate_coin_translations_batch(df: pd.DataFrame, chinese_col: str, english_col: str) -> List[Dict]:
+# Even when a pool is requested, smaller sheets run in-process. Measured: ~0.13 ms per row
+# in-process, while starting a pool costs ~0.06 s with fork but ~3 s with spawn (the
+# macOS/Windows default), since every spawned worker re-imports pandas; 20000 rows ≈ 2.6 s
+PARALLEL_MIN_ROWS = 20000
+
+def _available_cpu_count() -> int:
+    """CPUs this process may run on; unlike os.cpu_count() this respects affinity/cpuset limits"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        return os.cpu_count() or 1
+
+def iterrows_column_values(df: pd.DataFrame, col_name: str) -> List:
+    """
+    One column's cells exactly as df.iterrows() yields them. iterrows builds every row from
+    df.values, so an all-numeric frame is upcast to its common dtype (3 reads as 3.0);
+    any other frame leaves each column's own values untouched.
+    """
+    if all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+        return list(df.values[:, df.columns.get_loc(col_name)])
+    return df[col_name].tolist()
+
+def _analyze_coin_row(row_data: Tuple) -> Optional[Dict]:
+    """
+    Analyze a single (index, inventory, chinese, english) row.
+    Module-level so it can be pickled to multiprocessing workers.
+    Returns the issue dict, or None when the row passes or is skipped.
+    """
+    index, inventory_value, chinese_text, english_text, column_label = row_data
+    
+    # Skip empty rows (the batch function passes missing cells as None, the rest as str)
+    if chinese_text is None or english_text is None:
+        return None
+    
+    # Check if it's a Chinese coin lot
+    if not is_chinese_lot(chinese_text, english_text):
+        return None
+    
+    # Run COMPLETE FIXED analysis
+    match, chinese_numbers, english_numbers, status, notes = analyze_translation_complete(
+        chinese_text, english_text
+    )
+    
+    if match:
+        return None
+    
+    return {
+        'Row': index + 2,
+        'Inventory': inventory_value,
+        'Column': column_label,
+        'Issue_Type': f'COIN_TRANSLATION_{status}',
+        'Chinese_Text': chinese_text,
+        'English_Text': english_text,
+        'Chinese_Numbers': ', '.join(sorted(chinese_numbers)),
+        'English_Numbers': ', '.join(sorted(english_numbers)),
+        'Analysis_Notes': notes,
+        'Status': 'NEEDS_REVIEW'
+    }
+
+def validate_coin_translations_batch(df: pd.DataFrame, chinese_col: str, english_col: str,
+                                     n_workers: int = 1) -> List[Dict]:
     """
     Validate coin translations in a DataFrame.
     Returns list of issues found.
     PRESERVES ALL LOGIC from analyze_and_export_complete_fixed()
+    
+    Runs in this process by default. Rows are independent, so standalone scripts can
+    pass n_workers > 1 to spread large sheets across a process pool (capped at the CPUs
+    this process may use). Servers such as the Streamlit app should keep n_workers=1.
     """
-    issues = []
     inventory_col = df.columns[0] if len(df.columns) > 0 else None
+    column_label = f"{chinese_col} <-> {english_col}"
     
-    for index, row in df.iterrows():
-        chinese_text = row[chinese_col]
-        english_text = row[english_col]
-        
-        # Skip empty rows
-        if pd.isna(chinese_text) or pd.isna(english_text):
-            continue
-        
-        chinese_text = str(chinese_text)
-        english_text = str(english_text)
-        
-        # Check if it's a Chinese coin lot
-        if not is_chinese_lot(chinese_text, english_text):
-            continue
-        
-        # Run COMPLETE FIXED analysis
-        match, chinese_numbers, english_numbers, status, notes = analyze_translation_complete(
-            chinese_text, english_text
+    if inventory_col:
+        inventory_values = iterrows_column_values(df, inventory_col)
+    else:
+        inventory_values = [f"Row {index + 2}" for index in df.index]
+    
+    # Stringify both text columns up front with the same str() the row loop used
+    chinese_values = [None if pd.isna(value) else str(value) for value in iterrows_column_values(df, chinese_col)]
+    english_values = [None if pd.isna(value) else str(value) for value in iterrows_column_values(df, english_col)]
+    
+    rows = [
+        (index, inventory_value, chinese_text, english_text, column_label)
+        for index, inventory_value, chinese_text, english_text in zip(
+            df.index, inventory_values, chinese_values, english_values
         )
-        
-        if not match:
-            inventory_value = row[inventory_col] if inventory_col else f"Row {index + 2}"
-            issues.append({
-                'Row': index + 2,
-                'Inventory': inventory_value,
-                'Column': f"{chinese_col} <-> {english_col}",
-                'Issue_Type': f'COIN_TRANSLATION_{status}',
-                'Chinese_Text': chinese_text,
-                'English_Text': english_text,
-                'Chinese_Numbers': ', '.join(sorted(chinese_numbers)),
-                'English_Numbers': ', '.join(sorted(english_numbers)),
-                'Analysis_Notes': notes,
-                'Status': 'NEEDS_REVIEW'
-            })
-    
-    return issues
+    ]
+    
+    n_workers = min(n_workers, _available_cpu_count())
+    
+    if n_workers > 1 and len(rows) >= PARALLEL_MIN_ROWS:
+        chunksize = max(1, len(rows) // (n_workers * 4))
+        with multiprocessing.Pool(n_workers) as pool:
+            results = pool.map(_analyze_coin_row, rows, chunksize=chunksize)
+    else:
+        results = map(_analyze_coin_row, rows)
+    
+    return [issue for issue in results if issue is not None]
+
+# Header cell style DataFrame.to_excel applied before pandas 3.0 (bold, thin border, centered)
+EXCEL_HEADER_FORMAT = {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}
+
+COIN_ISSUE_COLUMNS = [
+    'Row', 'Inventory', 'Column', 'Issue_Type', 'Chinese_Text', 'English_Text',
+    'Chinese_Numbers', 'English_Numbers', 'Analysis_Notes', 'Status'
+]
+
+def write_dataframe_to_excel(df: pd.DataFrame, target) -> None:
+    """
+    Write df (without its index) to an .xlsx path or file-like target.
+    Rows are streamed in xlsxwriter's constant-memory mode, which only accepts strictly
+    row-by-row writes (DataFrame.to_excel does not do that), while keeping to_excel's
+    cells: URL-like text stays a plain string and dates get to_excel's number formats.
+    """
+    workbook = xlsxwriter.Workbook(target, {
+        'constant_memory': True,
+        'strings_to_urls': False,
+        'default_date_format': 'YYYY-MM-DD HH:MM:SS',
+    })
+    header_format = workbook.add_format(EXCEL_HEADER_FORMAT)
+    date_format = workbook.add_format({'num_format': 'YYYY-MM-DD'})
+    worksheet = workbook.add_worksheet()
+    worksheet.write_row(0, 0, df.columns.tolist(), header_format)
+    
+    # Plain datetime.date values (object columns only) get the date-only format
+    object_columns = [col_num for col_num, dtype in enumerate(df.dtypes) if dtype == object]
+    for row_num, row in enumerate(df.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_num, 0, [None if pd.isna(value) else value for value in row])
+        for col_num in object_columns:
+            value = row[col_num]
+            if isinstance(value, date) and not isinstance(value, datetime):
+                worksheet.write_datetime(row_num, col_num, value, date_format)
+    workbook.close()
 
 def export_coin_validation_results(issues: List[Dict], output_filename: str = None) -> str:
     """Export coin validation results to Excel"""
@@ -486,16 +627,11 @@ def export_coin_validation_results(issues: List[Dict], output_filename: str = No
         output_filename = f"COIN_validation_{timestamp}.xlsx"
     
     if issues:
-        output_df = pd.DataFrame(issues)
-        output_df.to_excel(output_filename, index=False)
+        write_dataframe_to_excel(pd.DataFrame(issues), output_filename)
         return f"Exported {len(issues)} coin translation issues to {output_filename}"
     else:
-        # Create empty file with headers
-        empty_df = pd.DataFrame(columns=[
-            'Row', 'Inventory', 'Column', 'Issue_Type', 'Chinese_Text', 'English_Text',
-            'Chinese_Numbers', 'English_Numbers', 'Analysis_Notes', 'Status'
-        ])
-        empty_df.to_excel(output_filename, index=False)
+        # Empty file with headers
+        write_dataframe_to_excel(pd.DataFrame(columns=COIN_ISSUE_COLUMNS), output_filename)
         return f"No coin translation issues found - empty report saved to {output_filename}"
 
 # Interactive functions for standalone use
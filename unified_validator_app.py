@@ -6,8 +6,8 @@ from datetime import datetime
 # Import your validator modules
 try:
     from traditional_validator_module import validate_traditional_chinese_batch
-    from coin_validator_module import validate_coin_translations_batch
-    from mint_checker_module import validate_mint_names_batch
+    from coin_validator_module import validate_coin_translations_batch, write_dataframe_to_excel
+    from mint_checker_module import validate_mint_names_batch, InteractiveMintChecker, download_official_mint_database
     from banknote_validator_module import validate_banknote_translations_batch
 except ImportError as e:
     st.error(f"Error importing validator modules: {e}")
@@ -16,74 +16,99 @@ except ImportError as e:
 # Password protection
 PASSWORD = "123456"
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_mint_database():
+    """Download the official mint workbook; reruns within the hour reuse the bytes"""
+    return download_official_mint_database()
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_mint_checker(db_bytes):
+    """Index the official mint database once per downloaded version"""
+    checker = InteractiveMintChecker()
+    checker.load_official_mint_database(BytesIO(db_bytes))
+    return checker
+
+# Uploads are cached server-wide, shared by every session; keep only a few recent ones
+UPLOAD_CACHE_MAX_ENTRIES = 4
+UPLOAD_CACHE_TTL_SECONDS = 1800
+
+@st.cache_data(show_spinner=False, max_entries=UPLOAD_CACHE_MAX_ENTRIES, ttl=UPLOAD_CACHE_TTL_SECONDS)
+def read_uploaded_excel(file_bytes):
+    """Parse the uploaded workbook once; widget reruns reuse the cached DataFrame"""
+    # calamine parses .xlsx/.xls natively, much faster than openpyxl's pure-Python reader
+    return pd.read_excel(BytesIO(file_bytes), engine='calamine')
+
 def add_validation_columns_to_dataframe(df, validation_type, traditional_issues, translation_issues, mint_issues):
     """
     Add validation result columns directly to the original DataFrame.
     Only adds columns, never adds new rows.
     """
-    # Make a copy to avoid modifying the original
-    result_df = df.copy()
+    # Build each validation column as a plain list, then attach them all in one
+    # assign; this also returns a copy, so the original is never modified
+    n_rows = len(df)
+    columns = {}
     
-    # Initialize validation columns with default values
     # Traditional Chinese validation columns (always added)
-    result_df['Traditional_Chinese_Issue'] = False
-    result_df['Simplified_Characters_Found'] = ''
-    result_df['Traditional_Suggestions'] = ''
+    columns['Traditional_Chinese_Issue'] = [False] * n_rows
+    columns['Simplified_Characters_Found'] = [''] * n_rows
+    columns['Traditional_Suggestions'] = [''] * n_rows
     
     if validation_type == "Coins":
         # Coin Translation validation columns
-        result_df['Coin_Translation_Issue'] = False
-        result_df['Translation_Issue_Type'] = ''
-        result_df['Chinese_Numbers_Found'] = ''
-        result_df['English_Numbers_Found'] = ''
-        result_df['Translation_Analysis_Notes'] = ''
+        columns['Coin_Translation_Issue'] = [False] * n_rows
+        columns['Translation_Issue_Type'] = [''] * n_rows
+        columns['Chinese_Numbers_Found'] = [''] * n_rows
+        columns['English_Numbers_Found'] = [''] * n_rows
+        columns['Translation_Analysis_Notes'] = [''] * n_rows
         
         # Mint validation columns
-        result_df['Mint_Issue'] = False
-        result_df['Mint_Change_Type'] = ''
-        result_df['English_Mint_Found'] = ''
-        result_df['Current_Chinese_Mint'] = ''
-        result_df['Correct_Chinese_Mint'] = ''
+        columns['Mint_Issue'] = [False] * n_rows
+        columns['Mint_Change_Type'] = [''] * n_rows
+        columns['English_Mint_Found'] = [''] * n_rows
+        columns['Current_Chinese_Mint'] = [''] * n_rows
+        columns['Correct_Chinese_Mint'] = [''] * n_rows
     else:  # Banknotes
         # Banknote Translation validation columns
-        result_df['Banknote_Translation_Issue'] = False
-        result_df['Translation_Issue_Type'] = ''
-        result_df['Chinese_Numbers_Found'] = ''
-        result_df['English_Numbers_Found'] = ''
-        result_df['Translation_Analysis_Notes'] = ''
+        columns['Banknote_Translation_Issue'] = [False] * n_rows
+        columns['Translation_Issue_Type'] = [''] * n_rows
+        columns['Chinese_Numbers_Found'] = [''] * n_rows
+        columns['English_Numbers_Found'] = [''] * n_rows
+        columns['Translation_Analysis_Notes'] = [''] * n_rows
     
     # Process Traditional Chinese issues
     for issue in traditional_issues:
         row_idx = issue['Row'] - 2  # Convert Excel row to DataFrame index
-        if 0 <= row_idx < len(result_df):
-            result_df.at[row_idx, 'Traditional_Chinese_Issue'] = True
-            result_df.at[row_idx, 'Simplified_Characters_Found'] = issue.get('Simplified_Found', '')
-            result_df.at[row_idx, 'Traditional_Suggestions'] = issue.get('Suggestions', '')
+        if 0 <= row_idx < n_rows:
+            columns['Traditional_Chinese_Issue'][row_idx] = True
+            columns['Simplified_Characters_Found'][row_idx] = issue.get('Simplified_Found', '')
+            columns['Traditional_Suggestions'][row_idx] = issue.get('Suggestions', '')
     
     # Process Translation issues
     for issue in translation_issues:
         row_idx = issue['Row'] - 2  # Convert Excel row to DataFrame index
-        if 0 <= row_idx < len(result_df):
+        if 0 <= row_idx < n_rows:
             if validation_type == "Coins":
-                result_df.at[row_idx, 'Coin_Translation_Issue'] = True
+                columns['Coin_Translation_Issue'][row_idx] = True
             else:
-                result_df.at[row_idx, 'Banknote_Translation_Issue'] = True
+                columns['Banknote_Translation_Issue'][row_idx] = True
             
-            result_df.at[row_idx, 'Translation_Issue_Type'] = issue.get('Issue_Type', '').replace('COIN_TRANSLATION_', '').replace('BANKNOTE_', '')
-            result_df.at[row_idx, 'Chinese_Numbers_Found'] = issue.get('Chinese_Numbers', '')
-            result_df.at[row_idx, 'English_Numbers_Found'] = issue.get('English_Numbers', '')
-            result_df.at[row_idx, 'Translation_Analysis_Notes'] = issue.get('Analysis_Notes', '')
+            columns['Translation_Issue_Type'][row_idx] = issue.get('Issue_Type', '').replace('COIN_TRANSLATION_', '').replace('BANKNOTE_', '')
+            columns['Chinese_Numbers_Found'][row_idx] = issue.get('Chinese_Numbers', '')
+            columns['English_Numbers_Found'][row_idx] = issue.get('English_Numbers', '')
+            columns['Translation_Analysis_Notes'][row_idx] = issue.get('Analysis_Notes', '')
     
     # Process Mint issues (only for coins)
     if validation_type == "Coins":
         for issue in mint_issues:
             row_idx = issue['Row'] - 2  # Convert Excel row to DataFrame index
-            if 0 <= row_idx < len(result_df):
-                result_df.at[row_idx, 'Mint_Issue'] = True
-                result_df.at[row_idx, 'Mint_Change_Type'] = issue.get('Issue_Type', '').replace('MINT_', '')
-                result_df.at[row_idx, 'English_Mint_Found'] = issue.get('English_Mint_Found', '')
-                result_df.at[row_idx, 'Current_Chinese_Mint'] = issue.get('Current_Chinese_Mint', '')
-                result_df.at[row_idx, 'Correct_Chinese_Mint'] = issue.get('Correct_Chinese_Mint', '')
+            if 0 <= row_idx < n_rows:
+                columns['Mint_Issue'][row_idx] = True
+                columns['Mint_Change_Type'][row_idx] = issue.get('Issue_Type', '').replace('MINT_', '')
+                columns['English_Mint_Found'][row_idx] = issue.get('English_Mint_Found', '')
+                columns['Current_Chinese_Mint'][row_idx] = issue.get('Current_Chinese_Mint', '')
+                columns['Correct_Chinese_Mint'][row_idx] = issue.get('Correct_Chinese_Mint', '')
+    
+    result_df = df.assign(**columns)
     
     return result_df
 
@@ -109,7 +134,7 @@ def main_app():
     
     if uploaded_file:
         try:
-            df = pd.read_excel(uploaded_file)
+            df = read_uploaded_excel(uploaded_file.getvalue())
             st.success(f"📊 Loaded {len(df)} rows with {len(df.columns)} columns")
             
             # Show preview
@@ -177,8 +202,9 @@ def main_app():
                         progress_bar.progress(50)
                         
                         try:
+                            # Never start worker processes inside the Streamlit server
                             translation_issues = validate_coin_translations_batch(
-                                df, chinese_translation_col, english_translation_col
+                                df, chinese_translation_col, english_translation_col, n_workers=1
                             )
                             st.write(f"✅ Coin Translations: Found {len(translation_issues)} issues")
                         except Exception as e:
@@ -190,7 +216,8 @@ def main_app():
                         
                         try:
                             mint_issues = validate_mint_names_batch(
-                                df, english_translation_col, chinese_translation_col
+                                df, english_translation_col, chinese_translation_col,
+                                checker=load_mint_checker(fetch_mint_database())
                             )
                             st.write(f"✅ Mint Names: Found {len(mint_issues)} issues")
                         except Exception as e:
@@ -289,7 +316,7 @@ def main_app():
                 filename = f"ENHANCED_{validation_type.upper()}_{timestamp}.xlsx"
                 
                 # Single sheet with enhanced data
-                enhanced_df.to_excel(output, index=False, engine='openpyxl')
+                write_dataframe_to_excel(enhanced_df, output)
                 output.seek(0)
                 
                 st.download_button(